@@ -11,6 +11,19 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
+    archive_after_months: int = 6
+    archive_interval_hours: float = 24  # 0 disables the background archival job
+
+    rate_limit_backend: str = "memory"  # "memory" or "mongo" to share buckets between workers
+    rate_limit_max_keys: int = 100_000  # in-memory buckets kept before evicting the least recent
+    login_ip_burst: int = 20
+    login_ip_per_minute: float = 10
+    login_email_burst: int = 5
+    login_email_per_minute: float = 1
+    refresh_ip_burst: int = 30
+    refresh_ip_per_minute: float = 20
+    refresh_user_burst: int = 5
+    refresh_user_per_minute: float = 2
 
     @property
     def cors_origins_list(self) -> list[str]:
@@ -18,6 +18,7 @@ async def connect_to_database():
     
     await database.db.users.create_index("email", unique=True)
     await database.db.entries.create_index([("user_id", 1), ("created_at", -1)])
+    await database.db.entry_archives.create_index([("user_id", 1), ("month", -1)])
     
     print(f"Connected to MongoDB: {settings.database_name}")
 
@@ -1,10 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 
 from app.config import get_settings
-from app.database import connect_to_database, close_database_connection
+from app.database import connect_to_database, close_database_connection, get_database
 from app.routes import api_router
+from app.services.archive import archive_stats, run_archive_loop
+from app.services.ratelimit import init_rate_limit_store, rate_limit_stats
+from app.services.singleflight import read_flight
 
 settings = get_settings()
 
@@ -12,7 +16,17 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_to_database()
+    await init_rate_limit_store(get_database())
+    archive_task = None
+    if settings.archive_interval_hours > 0:
+        archive_task = asyncio.create_task(
+            run_archive_loop(get_database(), settings.archive_interval_hours)
+        )
     yield
+    if archive_task:
+        archive_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await archive_task
     await close_database_connection()
 
 
@@ -29,6 +43,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 app.include_router(api_router, prefix="/api")
@@ -37,3 +52,12 @@ app.include_router(api_router, prefix="/api")
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "archive": archive_stats,
+        "coalescing": read_flight.stats,
+        "rate_limit": rate_limit_stats,
+    }
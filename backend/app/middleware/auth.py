@@ -3,6 +3,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.database import get_database
 from app.services.auth import decode_token
+from app.services.singleflight import read_flight
 from app.models.user import UserInDB
 
 security = HTTPBearer()
@@ -33,7 +34,10 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_doc = await db.users.find_one({"_id": payload.sub})
+    user_doc = await read_flight.do(
+        ("user", payload.sub),
+        lambda: db.users.find_one({"_id": payload.sub}),
+    )
     if user_doc is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,4 +52,5 @@ async def get_current_user(
         password_hash=user_doc["password_hash"],
         avatar_url=user_doc.get("avatar_url"),
         created_at=user_doc["created_at"],
+        entries_version=user_doc.get("entries_version", 0),
     )
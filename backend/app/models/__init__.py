@@ -1,5 +1,12 @@
 from app.models.user import User, UserCreate, UserUpdate, UserInDB
-from app.models.entry import MoodEntry, MoodEntryCreate, MoodEntryInDB, MoodAverages
+from app.models.entry import (
+    MoodEntry,
+    MoodEntryCreate,
+    MoodEntryInDB,
+    MoodAverages,
+    MoodInsights,
+    RollingStats,
+)
 
 __all__ = [
     "User",
@@ -10,4 +17,6 @@ __all__ = [
     "MoodEntryCreate",
     "MoodEntryInDB",
     "MoodAverages",
+    "MoodInsights",
+    "RollingStats",
 ]
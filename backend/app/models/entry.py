@@ -46,3 +46,21 @@ class MoodAverages(BaseModel):
     mood_trend: str = Field(..., description="increase, decrease, or same")
     sleep_trend: str = Field(..., description="increase, decrease, or same")
     entries_count: int = Field(..., description="Total number of entries used")
+
+
+class RollingStats(BaseModel):
+    window: int = Field(..., description="Number of entries in the window")
+    mood_avg: Optional[float] = Field(None, description="Mean mood over the latest window")
+    sleep_avg: Optional[float] = Field(None, description="Mean sleep over the latest window")
+    mood_best: Optional[float] = Field(None, description="Highest windowed mood mean in history")
+    mood_worst: Optional[float] = Field(None, description="Lowest windowed mood mean in history")
+
+
+class MoodInsights(BaseModel):
+    entries_count: int
+    rolling: list[RollingStats]
+    sleep_mood_pearson: Optional[float] = Field(None, description="Pearson correlation of sleep and mood")
+    sleep_mood_spearman: Optional[float] = Field(None, description="Spearman correlation of sleep and mood")
+    current_streak: int = Field(..., description="Consecutive days logged, ending today or yesterday")
+    longest_streak: int = Field(..., description="Longest run of consecutive days logged")
+    mood_volatility: Optional[float] = Field(None, description="Std deviation of entry-to-entry mood change")
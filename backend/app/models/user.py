@@ -36,3 +36,4 @@ class UserInDB(UserBase):
     password_hash: str
     avatar_url: Optional[str] = None
     created_at: datetime
+    entries_version: int = 0
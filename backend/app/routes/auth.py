@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime, timezone
 import uuid
@@ -13,6 +13,13 @@ from app.services.auth import (
     create_refresh_token,
     decode_token,
 )
+from app.services.ratelimit import (
+    get_client_ip,
+    login_ip_limiter,
+    login_email_limiter,
+    refresh_ip_limiter,
+    refresh_user_limiter,
+)
 
 router = APIRouter()
 
@@ -53,8 +60,13 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     user_data: UserLogin,
+    request: Request,
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
+    client_ip = get_client_ip(request)
+    await login_ip_limiter.check(client_ip)
+    await login_email_limiter.check(f"{client_ip}:{user_data.email.lower()}")
+
     user_doc = await db.users.find_one({"email": user_data.email})
     if not user_doc:
         raise HTTPException(
@@ -78,8 +90,11 @@ async def login(
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     request: RefreshTokenRequest,
+    http_request: Request,
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
+    await refresh_ip_limiter.check(get_client_ip(http_request))
+
     payload = decode_token(request.refresh_token)
     if payload is None:
         raise HTTPException(
@@ -93,6 +108,8 @@ async def refresh_token(
             detail="Invalid token type",
         )
 
+    await refresh_user_limiter.check(payload.sub)
+
     user_doc = await db.users.find_one({"_id": payload.sub})
     if not user_doc:
         raise HTTPException(
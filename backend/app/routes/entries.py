@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime, timezone, timedelta
 import uuid
@@ -6,7 +6,10 @@ import uuid
 from app.database import get_database
 from app.middleware.auth import get_current_user
 from app.models.user import UserInDB
-from app.models.entry import MoodEntry, MoodEntryCreate, MoodAverages
+from app.models.entry import MoodEntry, MoodEntryCreate, MoodAverages, MoodInsights
+from app.services.archive import find_recent_entries
+from app.services.insights import get_insights
+from app.services.singleflight import read_flight
 
 router = APIRouter()
 
@@ -24,12 +27,13 @@ async def get_entries(
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: UserInDB = Depends(get_current_user),
 ):
-    cursor = db.entries.find(
-        {"user_id": current_user.id}
-    ).sort("created_at", -1).limit(limit)
+    docs = await read_flight.do(
+        ("entries", current_user.id, limit, current_user.entries_version),
+        lambda: find_recent_entries(db, current_user.id, limit),
+    )
 
     entries = []
-    async for doc in cursor:
+    for doc in docs:
         entries.append(MoodEntry(
             id=str(doc["_id"]),
             user_id=doc["user_id"],
@@ -100,6 +104,12 @@ async def create_entry(
     }
 
     await db.entries.insert_one(entry_doc)
+    await db.users.update_one(
+        {"_id": current_user.id},
+        {"$inc": {"entries_version": 1}},
+    )
+    # Later requests must load the bumped entries_version
+    read_flight.forget(("user", current_user.id))
 
     return MoodEntry(
         id=entry_id,
@@ -117,12 +127,17 @@ async def get_averages(
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: UserInDB = Depends(get_current_user),
 ):
-    cursor = db.entries.find(
-        {"user_id": current_user.id}
-    ).sort("created_at", -1).limit(10)
+    return await read_flight.do(
+        ("averages", current_user.id, current_user.entries_version),
+        lambda: compute_averages(db, current_user.id),
+    )
+
+
+async def compute_averages(db: AsyncIOMotorDatabase, user_id: str) -> MoodAverages:
+    docs = await find_recent_entries(db, user_id, 10)
 
     entries = []
-    async for doc in cursor:
+    for doc in docs:
         entries.append({
             "mood": doc["mood"],
             "sleep_hours": doc["sleep_hours"],
@@ -173,3 +188,23 @@ async def get_averages(
         sleep_trend=get_trend(current_sleep_avg, previous_sleep_avg),
         entries_count=total_entries,
     )
+
+
+@router.get("/insights", response_model=MoodInsights)
+async def get_mood_insights(
+    windows: list[int] = Query([7, 30]),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    if any(window < 2 or window > 365 for window in windows):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Windows must be between 2 and 365 entries",
+        )
+
+    window_key = tuple(sorted(set(windows)))
+    today = datetime.now(timezone.utc).toordinal()
+    return await read_flight.do(
+        ("insights", current_user.id, window_key, current_user.entries_version, today),
+        lambda: get_insights(db, current_user.id, current_user.entries_version, window_key, today),
+    )
@@ -4,6 +4,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.database import get_database
 from app.middleware.auth import get_current_user
 from app.models.user import User, UserInDB, UserUpdate
+from app.services.singleflight import read_flight
 
 router = APIRouter()
 
@@ -38,6 +39,7 @@ async def update_current_user_profile(
             {"_id": current_user.id},
             {"$set": update_data},
         )
+        read_flight.forget(("user", current_user.id))
 
     user_doc = await db.users.find_one({"_id": current_user.id})
 
@@ -0,0 +1,286 @@
+"""
+Cold-storage archival for mood entries.
+
+Entries older than ``archive_after_months`` whole calendar months are moved
+out of the ``entries`` collection into one ``entry_archives`` document per
+user per month. Each bucket stores its entries as parallel (columnar) arrays
+sorted by ``created_at`` ascending, so the hot ``(user_id, created_at)``
+index only covers recent data.
+
+Reads go through ``find_recent_entries``, which falls back to the buckets
+once the hot collection is exhausted and returns documents in the same
+shape as ``entries`` documents.
+
+Every worker runs the job loop, but a lease document in ``job_leases``
+lets only one of them archive at a time.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from app.config import get_settings
+
+settings = get_settings()
+
+ARCHIVE_LEASE_ID = "archive_entries"
+ARCHIVE_LEASE_SECONDS = 3600
+
+ARCHIVE_COLUMNS = ("ids", "moods", "feelings", "reflections", "sleep_hours", "created_at")
+
+archive_stats: dict = {
+    "runs": 0,
+    "last_run_at": None,
+    "entries_archived": 0,
+    "buckets_written": 0,
+    "hot_entries_before": None,
+    "hot_entries": None,
+    "archived_entries": None,
+    "buckets": None,
+    "hot_fraction": None,
+}
+
+
+def get_archive_cutoff(months: int, now: datetime | None = None) -> datetime:
+    """Start of the calendar month ``months`` months before the current one."""
+    now = now or datetime.now(timezone.utc)
+    total = now.year * 12 + (now.month - 1) - months
+    return datetime(total // 12, total % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def get_month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Mongo returns naive datetimes unless the client is tz_aware
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def expand_bucket(bucket: dict) -> list[dict]:
+    """Turn a bucket's columns back into entry documents, oldest first."""
+    return [
+        {
+            "_id": entry_id,
+            "user_id": bucket["user_id"],
+            "mood": mood,
+            "feelings": feelings,
+            "reflection": reflection,
+            "sleep_hours": sleep_hours,
+            "created_at": created_at,
+        }
+        for entry_id, mood, feelings, reflection, sleep_hours, created_at in zip(
+            *(bucket[column] for column in ARCHIVE_COLUMNS)
+        )
+    ]
+
+
+def _build_bucket(user_id: str, month: datetime, docs: list[dict], version: int) -> dict:
+    docs = sorted(docs, key=lambda doc: _as_utc(doc["created_at"]))
+    return {
+        "_id": f"{user_id}:{month:%Y-%m}",
+        "user_id": user_id,
+        "month": month,
+        "version": version,
+        "count": len(docs),
+        "ids": [doc["_id"] for doc in docs],
+        "moods": [doc["mood"] for doc in docs],
+        "feelings": [doc.get("feelings", []) for doc in docs],
+        "reflections": [doc.get("reflection") for doc in docs],
+        "sleep_hours": [doc["sleep_hours"] for doc in docs],
+        "created_at": [doc["created_at"] for doc in docs],
+    }
+
+
+async def _acquire_lease(db: AsyncIOMotorDatabase, owner: str) -> bool:
+    now = datetime.now(timezone.utc)
+    try:
+        await db.job_leases.update_one(
+            {"_id": ARCHIVE_LEASE_ID, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ARCHIVE_LEASE_SECONDS)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # Another worker holds an unexpired lease
+        return False
+    return True
+
+
+async def _release_lease(db: AsyncIOMotorDatabase, owner: str) -> None:
+    await db.job_leases.delete_one({"_id": ARCHIVE_LEASE_ID, "owner": owner})
+
+
+class LeaseLostError(Exception):
+    """Raised when the archival lease expired and another worker took it over."""
+
+
+async def _write_bucket(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    month: datetime,
+    docs: list[dict],
+) -> None:
+    """
+    Merge ``docs`` into their monthly bucket, then delete the originals.
+
+    The bucket is replaced only if its ``version`` is unchanged since it was
+    read, so a concurrent writer's entries are never overwritten; on a
+    conflict the merge is retried from the fresh bucket.
+    """
+    bucket_id = f"{user_id}:{month:%Y-%m}"
+    while True:
+        existing = await db.entry_archives.find_one({"_id": bucket_id})
+        merged = {doc["_id"]: doc for doc in expand_bucket(existing)} if existing else {}
+        merged.update({doc["_id"]: doc for doc in docs})
+
+        if existing is None:
+            bucket = _build_bucket(user_id, month, list(merged.values()), 1)
+            try:
+                await db.entry_archives.insert_one(bucket)
+            except DuplicateKeyError:
+                continue
+            break
+
+        version = existing.get("version", 0)
+        bucket = _build_bucket(user_id, month, list(merged.values()), version + 1)
+        result = await db.entry_archives.replace_one(
+            {"_id": bucket_id, "version": existing.get("version")},
+            bucket,
+        )
+        if result.matched_count:
+            break
+
+    await db.entries.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+
+
+async def archive_old_entries(
+    db: AsyncIOMotorDatabase,
+    months: int | None = None,
+    now: datetime | None = None,
+) -> dict | None:
+    """
+    Move entries older than the retention window into monthly buckets.
+
+    Users are processed one at a time through the ``(user_id, created_at)``
+    index, holding at most one month of entries in memory. Each bucket is
+    rewritten from its existing contents plus the new entries before the
+    originals are deleted, so re-running after a partial failure never
+    duplicates or loses entries. Returns ``None`` if another worker holds
+    the archival lease.
+    """
+    owner = str(uuid.uuid4())
+    if not await _acquire_lease(db, owner):
+        return None
+
+    try:
+        months = settings.archive_after_months if months is None else months
+        cutoff = get_archive_cutoff(months, now)
+        hot_entries_before = await db.entries.estimated_document_count()
+
+        entries_archived = 0
+        buckets_written = 0
+
+        async def flush(user_id: str, month: datetime, docs: list[dict]) -> None:
+            nonlocal entries_archived, buckets_written
+            if not await _acquire_lease(db, owner):
+                raise LeaseLostError
+            await _write_bucket(db, user_id, month, docs)
+            entries_archived += len(docs)
+            buckets_written += 1
+
+        try:
+            async for user in db.users.find({}, {"_id": 1}):
+                user_id = str(user["_id"])
+                cursor = db.entries.find(
+                    {"user_id": user_id, "created_at": {"$lt": cutoff}}
+                ).sort("created_at", 1)
+
+                month = None
+                docs: list[dict] = []
+                async for doc in cursor:
+                    doc_month = get_month_start(_as_utc(doc["created_at"]))
+                    if docs and doc_month != month:
+                        await flush(user_id, month, docs)
+                        docs = []
+                    month = doc_month
+                    docs.append(doc)
+
+                if docs:
+                    await flush(user_id, month, docs)
+        except LeaseLostError:
+            print("Entry archival stopped, the lease was taken over by another worker")
+
+        archived_total = await db.entry_archives.aggregate([
+            {"$group": {"_id": None, "entries": {"$sum": "$count"}, "buckets": {"$sum": 1}}},
+        ]).to_list(1)
+        hot_entries = await db.entries.estimated_document_count()
+        archived_entries = archived_total[0]["entries"] if archived_total else 0
+
+        archive_stats["runs"] += 1
+        archive_stats["last_run_at"] = datetime.now(timezone.utc)
+        archive_stats["entries_archived"] += entries_archived
+        archive_stats["buckets_written"] += buckets_written
+        archive_stats["hot_entries_before"] = hot_entries_before
+        archive_stats["hot_entries"] = hot_entries
+        archive_stats["archived_entries"] = archived_entries
+        archive_stats["buckets"] = archived_total[0]["buckets"] if archived_total else 0
+        # Each hot entry is one key in the (user_id, created_at) index
+        total = hot_entries + archived_entries
+        archive_stats["hot_fraction"] = round(hot_entries / total, 4) if total else None
+    finally:
+        await _release_lease(db, owner)
+
+    return {
+        "cutoff": cutoff,
+        "entries_archived": entries_archived,
+        "buckets_written": buckets_written,
+    }
+
+
+async def run_archive_loop(db: AsyncIOMotorDatabase, interval_hours: float) -> None:
+    while True:
+        try:
+            result = await archive_old_entries(db)
+            if result is None:
+                print("Entry archival skipped, another worker holds the lease")
+            else:
+                print(
+                    f"Archived {result['entries_archived']} entries into "
+                    f"{result['buckets_written']} monthly buckets"
+                )
+        except Exception as e:
+            print(f"Entry archival failed: {e}")
+        await asyncio.sleep(interval_hours * 3600)
+
+
+async def find_recent_entries(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    limit: int,
+) -> list[dict]:
+    """
+    Newest ``limit`` entries for a user, reading archived buckets if needed.
+
+    ``limit`` follows MongoDB cursor semantics: ``0`` means no limit and a
+    negative value is treated as its absolute value.
+    """
+    cursor = db.entries.find({"user_id": user_id}).sort("created_at", -1).limit(limit)
+    docs = [doc async for doc in cursor]
+    cap = abs(limit) or None
+    if cap is not None and len(docs) >= cap:
+        return docs
+
+    # An entry sits in both places between a bucket write and its delete
+    hot_ids = {doc["_id"] for doc in docs}
+    async for bucket in db.entry_archives.find({"user_id": user_id}).sort("month", -1):
+        for doc in reversed(expand_bucket(bucket)):
+            if doc["_id"] in hot_ids:
+                continue
+            docs.append(doc)
+            if cap is not None and len(docs) >= cap:
+                return docs
+    return docs
@@ -0,0 +1,171 @@
+"""
+Long-term mood insights computed over a user's full history with NumPy.
+
+History is loaded with a projection straight into contiguous arrays (the
+archived monthly buckets are already columnar), and every statistic is a
+vectorized pass over those arrays. Results are memoized per user,
+``entries_version`` (bumped by ``create_entry``) and UTC day, so repeat
+views of the dashboard don't recompute anything.
+"""
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.models.entry import MoodInsights, RollingStats
+
+CACHE_SIZE = 1024
+
+_cache: OrderedDict[tuple, tuple[tuple[int, int], MoodInsights]] = OrderedDict()
+
+
+def history_arrays(
+    buckets: list[dict],
+    docs: list[dict],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Mood, sleep and day-ordinal arrays from archive buckets and hot entries, oldest first."""
+    moods: list[int] = []
+    sleep: list[float] = []
+    created: list[datetime] = []
+
+    # An entry sits in both places between a bucket write and its delete
+    hot_ids = {doc["_id"] for doc in docs}
+    for bucket in buckets:
+        if hot_ids.isdisjoint(bucket["ids"]):
+            moods.extend(bucket["moods"])
+            sleep.extend(bucket["sleep_hours"])
+            created.extend(bucket["created_at"])
+            continue
+        for entry_id, mood, sleep_hours, created_at in zip(
+            bucket["ids"], bucket["moods"], bucket["sleep_hours"], bucket["created_at"]
+        ):
+            if entry_id not in hot_ids:
+                moods.append(mood)
+                sleep.append(sleep_hours)
+                created.append(created_at)
+
+    for doc in docs:
+        moods.append(doc["mood"])
+        sleep.append(doc["sleep_hours"])
+        created.append(doc["created_at"])
+
+    return (
+        np.asarray(moods, dtype=np.float64),
+        np.asarray(sleep, dtype=np.float64),
+        np.fromiter((value.toordinal() for value in created), dtype=np.int64, count=len(created)),
+    )
+
+
+async def load_history(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    buckets = await db.entry_archives.find(
+        {"user_id": user_id},
+        {"ids": 1, "moods": 1, "sleep_hours": 1, "created_at": 1},
+    ).sort("month", 1).to_list(None)
+
+    docs = await db.entries.find(
+        {"user_id": user_id},
+        {"mood": 1, "sleep_hours": 1, "created_at": 1},
+    ).sort("created_at", 1).to_list(None)
+
+    return history_arrays(buckets, docs)
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    return (sums[window:] - sums[:-window]) / window
+
+
+def _pearson(x: np.ndarray, y: np.ndarray) -> float | None:
+    if x.size < 2:
+        return None
+    xc = x - x.mean()
+    yc = y - y.mean()
+    denom = np.sqrt((xc @ xc) * (yc @ yc))
+    if denom == 0:
+        return None
+    return float((xc @ yc) / denom)
+
+
+def _rank(values: np.ndarray) -> np.ndarray:
+    # 1-based ranks, ties get the average of the ranks they span
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ends = np.cumsum(counts)
+    return (ends - (counts - 1) / 2.0)[inverse]
+
+
+def _streaks(days: np.ndarray, today: int) -> tuple[int, int]:
+    days = np.unique(days)
+    if days.size == 0:
+        return 0, 0
+    breaks = np.flatnonzero(np.diff(days) != 1)
+    bounds = np.concatenate(([0], breaks + 1, [days.size]))
+    runs = np.diff(bounds)
+    current = int(runs[-1]) if days[-1] >= today - 1 else 0
+    return current, int(runs.max())
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
+
+
+def compute_insights(
+    moods: np.ndarray,
+    sleep: np.ndarray,
+    days: np.ndarray,
+    windows: tuple[int, ...],
+    today: int,
+) -> MoodInsights:
+    rolling = []
+    for window in windows:
+        if moods.size < window:
+            rolling.append(RollingStats(window=window))
+            continue
+        mood_means = _rolling_mean(moods, window)
+        rolling.append(RollingStats(
+            window=window,
+            mood_avg=round(float(mood_means[-1]), 2),
+            sleep_avg=round(float(_rolling_mean(sleep, window)[-1]), 2),
+            mood_best=round(float(mood_means.max()), 2),
+            mood_worst=round(float(mood_means.min()), 2),
+        ))
+
+    current_streak, longest_streak = _streaks(days, today)
+    mood_changes = np.diff(moods)
+
+    return MoodInsights(
+        entries_count=int(moods.size),
+        rolling=rolling,
+        sleep_mood_pearson=_round(_pearson(sleep, moods)),
+        sleep_mood_spearman=_round(_pearson(_rank(sleep), _rank(moods))) if moods.size else None,
+        current_streak=current_streak,
+        longest_streak=longest_streak,
+        mood_volatility=round(float(mood_changes.std()), 2) if mood_changes.size else None,
+    )
+
+
+async def get_insights(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    entries_version: int,
+    windows: tuple[int, ...],
+    today: int,
+) -> MoodInsights:
+    key = (user_id, windows)
+    cached = _cache.get(key)
+    # Streaks depend on the current day as well as the data
+    if cached is not None and cached[0] == (entries_version, today):
+        _cache.move_to_end(key)
+        return cached[1]
+
+    moods, sleep, days = await load_history(db, user_id)
+    insights = compute_insights(moods, sleep, days, windows, today)
+
+    _cache[key] = ((entries_version, today), insights)
+    _cache.move_to_end(key)
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return insights
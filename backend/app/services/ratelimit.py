@@ -0,0 +1,151 @@
+"""
+Token-bucket throttling for the auth endpoints.
+
+``/auth/login`` runs bcrypt and ``/auth/refresh`` signs two tokens, so both
+are throttled before any of that work happens. Login is checked per IP and
+per (IP, email), so nobody can lock another user out by spending the tokens
+for their email. Refresh is checked per IP up front and per user only once
+the token's signature has been verified, so forged tokens can't drain
+another user's bucket.
+
+Buckets live in process memory by default; set ``RATE_LIMIT_BACKEND=mongo``
+to share them between workers through the ``rate_limits`` collection.
+"""
+import math
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from app.config import get_settings
+
+settings = get_settings()
+
+rate_limit_stats: dict = {"allowed": 0, "rejected": {}}
+
+
+class MemoryBucketStore:
+    """
+    Buckets stored as ``key -> [tokens, updated_at, refill_seconds]``.
+
+    Keys are kept in last-touched order, so idle buckets sit at the front.
+    Each ``take`` drops a few of those that have been idle for a full refill
+    (they are indistinguishable from new ones), and the least recently used
+    bucket is evicted once ``max_keys`` is reached, so neither the memory
+    nor the per-request work grows with a spray of distinct keys.
+    """
+
+    def __init__(self, max_keys: int, evict_batch: int = 32) -> None:
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._max_keys = max_keys
+        self._evict_batch = evict_batch
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [capacity, now, capacity / rate]
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0
+        return (1 - bucket[0]) / rate
+
+    def _evict_idle(self, now: float) -> None:
+        for _ in range(self._evict_batch):
+            if not self._buckets:
+                return
+            bucket = next(iter(self._buckets.values()))
+            if now - bucket[1] < bucket[2]:
+                return
+            self._buckets.popitem(last=False)
+
+
+class MongoBucketStore:
+    """Buckets shared between workers, updated atomically with a pipeline update."""
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self._collection = db.rate_limits
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        now = time.time()
+        refilled = {
+            "$min": [
+                capacity,
+                {"$add": [
+                    {"$ifNull": ["$tokens", capacity]},
+                    {"$multiply": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, rate]},
+                ]},
+            ]
+        }
+        doc = await self._collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": now}},
+                {"$set": {
+                    "allowed": {"$gte": ["$tokens", 1]},
+                    "tokens": {"$cond": [
+                        {"$gte": ["$tokens", 1]},
+                        {"$subtract": ["$tokens", 1]},
+                        "$tokens",
+                    ]},
+                    "expires_at": {"$add": ["$$NOW", int(capacity / rate * 1000)]},
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc["allowed"]:
+            return 0
+        return (1 - doc["tokens"]) / rate
+
+
+class RateLimiter:
+    def __init__(self, name: str, capacity: int, per_minute: float) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.rate = per_minute / 60
+
+    async def check(self, key: str) -> None:
+        """Take one token for ``key`` or raise 429 with a ``Retry-After`` header."""
+        retry_after = await _store.take(f"{self.name}:{key}", self.capacity, self.rate)
+        if retry_after <= 0:
+            rate_limit_stats["allowed"] += 1
+            return
+
+        rejected = rate_limit_stats["rejected"]
+        rejected[self.name] = rejected.get(self.name, 0) + 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+_store: MemoryBucketStore | MongoBucketStore = MemoryBucketStore(settings.rate_limit_max_keys)
+
+login_ip_limiter = RateLimiter("login_ip", settings.login_ip_burst, settings.login_ip_per_minute)
+login_email_limiter = RateLimiter("login_email", settings.login_email_burst, settings.login_email_per_minute)
+refresh_ip_limiter = RateLimiter("refresh_ip", settings.refresh_ip_burst, settings.refresh_ip_per_minute)
+refresh_user_limiter = RateLimiter("refresh_user", settings.refresh_user_burst, settings.refresh_user_per_minute)
+
+
+async def init_rate_limit_store(db: AsyncIOMotorDatabase) -> None:
+    global _store
+    if settings.rate_limit_backend == "mongo":
+        await db.rate_limits.create_index("expires_at", expireAfterSeconds=0)
+        _store = MongoBucketStore(db)
+
+
+def get_client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
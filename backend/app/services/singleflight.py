@@ -0,0 +1,64 @@
+"""
+Request coalescing for concurrent identical reads.
+
+The dashboard loads ``/today``, ``/entries`` and ``/averages`` together, and
+multiple tabs or the client's refresh-and-retry interceptor often repeat
+those requests while the first ones are still running. ``SingleFlight`` lets
+concurrent callers with the same key await one in-flight task instead of
+each hitting MongoDB.
+
+Keys for reads that a write can change carry a write generation, or the
+write path calls ``forget``, so a read issued after a write never shares a
+result fetched before it.
+
+Cancelling a caller only detaches that caller; the shared task keeps running
+for the others and is cancelled once no caller is left waiting on it.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, tuple[asyncio.Task, list[int]]] = {}
+        self.stats = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats["calls"] += 1
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(fn())
+            call = (task, [0])
+            self._calls[key] = call
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.stats["executed"] += 1
+        else:
+            self.stats["coalesced"] += 1
+
+        task, waiters = call
+        waiters[0] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            waiters[0] -= 1
+            if waiters[0] == 0 and not task.done():
+                task.cancel()
+                self._forget(key, task)
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Make later callers for ``key`` start a fresh flight.
+
+        Call this after a write so no read issued afterwards can join a
+        flight that started before it. Callers already waiting keep the
+        in-flight result.
+        """
+        self._calls.pop(key, None)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        call = self._calls.get(key)
+        if call is not None and call[0] is task:
+            del self._calls[key]
+
+
+read_flight = SingleFlight()
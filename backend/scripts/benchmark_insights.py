@@ -0,0 +1,83 @@
+"""
+Benchmark the insights cache-miss path over 10 years of synthetic daily entries.
+
+Times building the arrays from archive-bucket and entry shaped documents
+(``history_arrays``) and the statistics themselves (``compute_insights``).
+The MongoDB round trip in ``load_history`` is not included.
+
+Run from the backend directory:
+    python -m scripts.benchmark_insights
+"""
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.services.insights import compute_insights, history_arrays
+
+DAYS = 365 * 10
+HOT_DAYS = 180
+RUNS = 200
+WINDOWS = (7, 30, 90)
+
+
+def build_documents() -> tuple[list[dict], list[dict]]:
+    rng = np.random.default_rng(42)
+    sleep = np.clip(rng.normal(7, 1.2, DAYS), 0, 24).round(1)
+    moods = np.clip(np.round((sleep - 7) * 0.6 + rng.normal(0, 1, DAYS)), -2, 2)
+    start = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=DAYS - 1)
+
+    docs = [
+        {
+            "_id": str(uuid.uuid4()),
+            "mood": int(moods[i]),
+            "sleep_hours": float(sleep[i]),
+            "created_at": start + timedelta(days=i),
+        }
+        for i in range(DAYS)
+    ]
+
+    buckets: dict[tuple[int, int], dict] = {}
+    for doc in docs[:-HOT_DAYS]:
+        created_at = doc["created_at"]
+        bucket = buckets.setdefault(
+            (created_at.year, created_at.month),
+            {"ids": [], "moods": [], "sleep_hours": [], "created_at": []},
+        )
+        bucket["ids"].append(doc["_id"])
+        bucket["moods"].append(doc["mood"])
+        bucket["sleep_hours"].append(doc["sleep_hours"])
+        bucket["created_at"].append(created_at)
+
+    return list(buckets.values()), docs[-HOT_DAYS:]
+
+
+def report(name: str, timings: list[float]) -> None:
+    values = np.asarray(timings)
+    print(f"{name:<16} median {np.median(values):.3f} ms, p95 {np.percentile(values, 95):.3f} ms")
+
+
+def main():
+    buckets, docs = build_documents()
+    today = datetime.now(timezone.utc).toordinal()
+
+    build_timings = []
+    compute_timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        moods, sleep, days = history_arrays(buckets, docs)
+        built = time.perf_counter()
+        compute_insights(moods, sleep, days, WINDOWS, today)
+        done = time.perf_counter()
+        build_timings.append((built - start) * 1000)
+        compute_timings.append((done - built) * 1000)
+
+    print(f"{DAYS} entries ({len(buckets)} buckets + {len(docs)} hot), {RUNS} runs")
+    report("history_arrays", build_timings)
+    report("compute_insights", compute_timings)
+    report("total", [a + b for a, b in zip(build_timings, compute_timings)])
+
+
+if __name__ == "__main__":
+    main()
@@ -69,6 +69,43 @@ const processQueue = (error: Error | null, token: string | null = null) => {
   failedQueue = [];
 };
 
+const MAX_RETRY_AFTER_SECONDS = 10;
+
+function getRetryAfterSeconds(error: AxiosError): number {
+  const seconds = Number(error.response?.headers['retry-after']);
+  return Number.isFinite(seconds) && seconds > 0 ? seconds : 1;
+}
+
+async function refreshTokens(refreshToken: string): Promise<AuthTokens> {
+  try {
+    const response = await api.post<AuthTokens>('/auth/refresh', {
+      refresh_token: refreshToken,
+    });
+    return response.data;
+  } catch (error) {
+    if (!axios.isAxiosError(error) || error.response?.status !== 429) {
+      throw error;
+    }
+
+    const retryAfter = getRetryAfterSeconds(error);
+    if (retryAfter > MAX_RETRY_AFTER_SECONDS) {
+      throw error;
+    }
+    await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+
+    // Another tab may have refreshed the shared tokens while we waited
+    const stored = getStoredTokens();
+    if (stored && stored.refresh_token !== refreshToken) {
+      return stored;
+    }
+
+    const response = await api.post<AuthTokens>('/auth/refresh', {
+      refresh_token: refreshToken,
+    });
+    return response.data;
+  }
+}
+
 api.interceptors.response.use(
   (response) => response,
   async (error: AxiosError<ApiError>) => {
@@ -105,11 +142,7 @@ api.interceptors.response.use(
       }
 
       try {
-        const response = await api.post<AuthTokens>('/auth/refresh', {
-          refresh_token: tokens.refresh_token,
-        });
-        
-        const newTokens = response.data;
+        const newTokens = await refreshTokens(tokens.refresh_token);
         setStoredTokens(newTokens);
         
         processQueue(null, newTokens.access_token);
@@ -120,6 +153,11 @@ api.interceptors.response.use(
         
         return api(originalRequest);
       } catch (refreshError) {
+        if (axios.isAxiosError(refreshError) && refreshError.response?.status === 429) {
+          // Throttled, not rejected: keep the tokens every tab shares
+          processQueue(refreshError, null);
+          return Promise.reject(refreshError);
+        }
         clearStoredTokens();
         processQueue(refreshError as Error, null);
         return Promise.reject(refreshError);